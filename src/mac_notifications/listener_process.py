@@ -1,29 +1,84 @@
 from __future__ import annotations
 
-from multiprocessing import Process, SimpleQueue
+import logging
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from typing import Any, List
+
+import objc
+from CoreFoundation import (
+    CFFileDescriptorCreate,
+    CFFileDescriptorCreateRunLoopSource,
+    CFFileDescriptorEnableCallBacks,
+    CFRunLoopAddSource,
+    CFRunLoopGetCurrent,
+    kCFFileDescriptorReadCallBack,
+    kCFRunLoopDefaultMode,
+)
+from PyObjCTools import AppHelper
 
 from mac_notifications import notification_sender
 from mac_notifications.notification_config import JSONNotificationConfig
 
+logger = logging.getLogger()
+
 
-class NotificationProcess(Process):
+class NotificationProcess(get_context("spawn").Process):  # type: ignore
     """
-    This is a simple process to launch a notification in a separate process.
+    This is a long-living process that sends notifications and listens for the user interactions with them.
 
     Why you may ask?
-    First, the way we need to launch a notification using a class, this class can only be instantiated once in a
-    process. Hence, for simple notifications we create a new process and then immediately stop it after the notification
-    was launched.
-    Second, waiting for the user interaction with a notification is a blocking operation.
+    Waiting for the user interaction with a notification is a blocking operation.
     Because it is a blocking operation, if we want to be able to receive any user interaction from the notification,
     without completely halting/freezing our main process, we need to open it in a background process.
+    The process runs the Cocoa event loop on a single thread. The `connection` over which the main process sends us the
+    notifications is attached to that event loop, so the same thread also handles the incoming notifications.
+    The process is always spawned, never forked. The main process may already have used Cocoa itself, and using AppKit
+    in a forked child of such a process is not supported.
     """
 
-    def __init__(self, notification_config: JSONNotificationConfig, queue: SimpleQueue | None):
+    def __init__(self, connection: Connection, callback_connection: Connection):
         super().__init__()
-        self.notification_config = notification_config
-        self.queue = queue
+        self.connection = connection
+        self.callback_connection = callback_connection
 
     def run(self) -> None:
-        notification_sender.create_notification(self.notification_config, self.queue).send()
-        # on if any of the callbacks are provided, start the event loop (this will keep the program from stopping)
+        file_descriptor = CFFileDescriptorCreate(None, self.connection.fileno(), False, self.poll, None)
+        CFFileDescriptorEnableCallBacks(file_descriptor, kCFFileDescriptorReadCallBack)
+        source = CFFileDescriptorCreateRunLoopSource(None, file_descriptor, 0)
+        CFRunLoopAddSource(CFRunLoopGetCurrent(), source, kCFRunLoopDefaultMode)
+        notification_sender.wait_activations(self.callback_connection)
+
+    def poll(self, file_descriptor: Any, callback_types: int, info: Any) -> None:
+        """
+        Called by the event loop when the main process sent us messages. We handle all messages that are available, so
+        a burst of notifications only costs a single wake-up. The Objective-C objects that are created while handling a
+        batch are released together by a single autorelease pool.
+        Once the main process closed its end of the connection, we stop the event loop so this process exits too.
+        """
+        connection_closed = False
+        try:
+            frames: List[bytes] = []
+            while self.connection.poll():
+                try:
+                    frames.append(self.connection.recv_bytes())
+                except EOFError:
+                    # The main process closed its end of the connection.
+                    connection_closed = True
+                    break
+
+            with objc.autorelease_pool():
+                for frame in frames:
+                    try:
+                        config = JSONNotificationConfig.from_bytes(frame)
+                    except (TypeError, ValueError):
+                        logger.warning(f"Received a malformed notification configuration: {frame!r}.")
+                        continue
+                    notification_sender.send_notification(config)
+        finally:
+            if connection_closed:
+                AppHelper.stopEventLoop()
+            else:
+                # The read callback is disabled after every call, so we have to ask for the next one. We also do this
+                # when handling a message failed, otherwise we would never hear from the main process again.
+                CFFileDescriptorEnableCallBacks(file_descriptor, kCFFileDescriptorReadCallBack)
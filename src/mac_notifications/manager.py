@@ -1,28 +1,35 @@
 from __future__ import annotations
 
 import atexit
+import json
 import logging
-import signal
-import sys
-import time
-from multiprocessing import SimpleQueue
-from threading import Event, Thread
-from typing import Dict, List
-
-from mac_notifications.listener_process import NotificationProcess
+from collections import OrderedDict
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from threading import Thread
+from typing import Dict, List, TYPE_CHECKING
+
 from mac_notifications.notification_config import NotificationConfig
 from mac_notifications.singleton import Singleton
 
+if TYPE_CHECKING:
+    from asyncio import AbstractEventLoop
+
+    from mac_notifications.listener_process import NotificationProcess
+
 """
 This is the module responsible for managing the notifications over time & enabling callbacks to be executed.
+Note: `notification_sender` and `listener_process` load AppKit & Foundation. We only import them once we actually
+create or cancel a notification, so importing this module stays cheap.
 """
 
 # Once we have created more than _MAX_NUMBER_OF_CALLBACKS_TO_TRACK notifications with a callback, we remove the older
 # callbacks.
 _MAX_NUMBER_OF_CALLBACKS_TO_TRACK: int = 1000
 # The _FIFO_LIST keeps track of the order of notifications with callbacks. This way we know what to remove after having
-# more than _MAX_NUMBER_OF_CALLBACKS_TO_TRACK number of notifications with a callback.
-_FIFO_LIST: List[str] = []
+# more than _MAX_NUMBER_OF_CALLBACKS_TO_TRACK number of notifications with a callback. It is an OrderedDict (used as an
+# ordered set) so that both removing the oldest and removing an arbitrary notification are O(1).
+_FIFO_LIST: "OrderedDict[str, None]" = OrderedDict()
 # The _NOTIFICATION_MAP is required to keep track of notifications that have a callback. We map the UID of the
 # notification to the process that was started for it and the configuration.
 # Note: _NOTIFICATION_MAP should only contain notifications with a callback!
@@ -34,56 +41,111 @@ class NotificationManager(metaclass=Singleton):
     """
     The NotificationManager is responsible for managing the notifications. This includes the following:
     - Starting new notifications.
-    - Starting the Callback Executor thread in the background.
+    - Starting the Callback Executor thread in the background, or executing the callbacks on an attached asyncio loop.
     """
 
     def __init__(self):
-        self._callback_queue: SimpleQueue = SimpleQueue()
-        self._callback_executor_event: Event = Event()
+        self._asyncio_loop: AbstractEventLoop | None = None
+        self._callback_connection: Connection | None = None
+        # The asyncio loop the callback connection is registered with, if we don't use the callback executor thread.
+        self._callback_connection_loop: AbstractEventLoop | None = None
         self._callback_executor_thread: CallbackExecutorThread | None = None
         self._callback_listener_process: NotificationProcess | None = None
+        self._callback_listener_connection: Connection | None = None
         # Specify that once we stop our application, self.cleanup should run
         atexit.register(self.cleanup)
-        # Specify that when we get a keyboard interrupt, this function should handle it
-        signal.signal(signal.SIGINT, handler=self.catch_keyboard_interrupt)
-
-    def create_callback_executor_thread(self) -> None:
-        """Creates the callback executor thread and sets the _callback_executor_event."""
-        if not (self._callback_executor_thread and self._callback_executor_thread.is_alive()):
-            self._callback_executor_thread = CallbackExecutorThread(
-                keep_running=self._callback_executor_event,
-                callback_queue=self._callback_queue,
+
+    def attach_asyncio(self, loop: AbstractEventLoop) -> None:
+        """
+        Execute the callbacks on an asyncio event loop instead of on a separate thread. This only applies to the
+        listener process that is started after this call, so call it before creating a notification with a callback.
+        :param loop: The event loop to execute the callbacks on.
+        """
+        if self._callback_connection is not None and self._callback_connection_loop is not loop:
+            logger.warning(
+                "A notification listener is already running, so its callbacks are not moved to the given asyncio loop. "
+                "Call attach_asyncio before creating a notification with a callback."
             )
-            self._callback_executor_event.set()
-            self._callback_executor_thread.start()
+        self._asyncio_loop = loop
+
+    def create_callback_executor_thread(self, callback_connection: Connection) -> None:
+        """Creates the callback executor thread."""
+        self._callback_executor_thread = CallbackExecutorThread(callback_connection=callback_connection)
+        self._callback_executor_thread.start()
 
-    def create_notification(self, notification_config: NotificationConfig) -> None:
+    def start_executing_callbacks(self, callback_connection: Connection) -> None:
+        """Start executing the callbacks received over `callback_connection`, on the asyncio loop if one is attached."""
+        self._callback_connection = callback_connection
+        if self._asyncio_loop is not None and self._asyncio_loop.is_closed():
+            # The attached loop is gone (e.g. `asyncio.run` finished), so we fall back to the thread.
+            self._asyncio_loop = None
+        if self._asyncio_loop is None:
+            self.create_callback_executor_thread(callback_connection)
+        else:
+            loop = self._callback_connection_loop = self._asyncio_loop
+            if is_running_on(loop):
+                start_draining_on_asyncio_loop(loop, callback_connection)
+            else:
+                # asyncio only allows changing the readers from the thread that runs the loop.
+                loop.call_soon_threadsafe(start_draining_on_asyncio_loop, loop, callback_connection)
+
+    def create_callback_listener_process(self) -> Connection:
+        """
+        Creates the long-living listener process and starts executing the callbacks for the user interactions it
+        reports. Returns the connection we use to send the listener process notifications.
+        """
+        from mac_notifications.listener_process import NotificationProcess
+
+        # The listener process is spawned (see NotificationProcess), so we use the matching context for the pipes.
+        context = get_context("spawn")
+        receiving_end, sending_end = context.Pipe(duplex=False)
+        # The listener process is the only one sending user interactions to us, so a one-way Pipe is enough. It
+        # avoids the locks a (Simple)Queue takes on every message.
+        callback_receiving_end, callback_sending_end = context.Pipe(duplex=False)
+        self._callback_listener_process = NotificationProcess(receiving_end, callback_sending_end)
+        self._callback_listener_process.start()
+        # The listener process has its own copies of these ends. Closing ours means we get an EOFError on the
+        # callback_receiving_end once the listener process stops.
+        receiving_end.close()
+        callback_sending_end.close()
+        self.start_executing_callbacks(callback_receiving_end)
+        return sending_end
+
+    def create_notification(self, notification_config: NotificationConfig) -> NotificationClosure:
         """
         Create a notification and the corresponding processes if required for a notification with callbacks.
         :param notification_config: The configuration for the notification.
+        :return: A NotificationClosure that can be used to cancel the notification.
         """
         json_config = notification_config.to_json_notification()
-        if not notification_config.contains_callback or self._callback_listener_process is not None:
-            # We can send it directly and kill the process after as we don't need to listen for callbacks.
-            new_process = NotificationProcess(json_config, None)
-            new_process.start()
-            new_process.join(timeout=5)
-        else:
-            # We need to also start a listener, so we send the json through a separate process.
-            self._callback_listener_process = NotificationProcess(json_config, self._callback_queue)
-            self._callback_listener_process.start()
-            self.create_callback_executor_thread()
+        if not notification_config.contains_callback:
+            # We don't need to listen for callbacks, so we can send it directly from this process.
+            from mac_notifications import notification_sender
+
+            notification_sender.send_notification(json_config)
+            return NotificationClosure(notification_config.uid)
 
-        if notification_config.contains_callback:
-            _FIFO_LIST.append(notification_config.uid)
-            _NOTIFICATION_MAP[notification_config.uid] = notification_config
-        self.clear_old_notifications()
+        if self._callback_listener_process is not None and not self._callback_listener_process.is_alive():
+            # The listener process stopped (e.g. it crashed or got killed), so we start over with a new one.
+            logger.warning("The notification listener process stopped unexpectedly. Starting a new one.")
+            self.cleanup()
+
+        if self._callback_listener_connection is None:
+            # We need to start a listener that waits for the user interactions with our notifications.
+            self._callback_listener_connection = self.create_callback_listener_process()
+
+        self._callback_listener_connection.send_bytes(json_config.to_bytes())
+        _FIFO_LIST[notification_config.uid] = None
+        _NOTIFICATION_MAP[notification_config.uid] = notification_config
+        if len(_FIFO_LIST) > _MAX_NUMBER_OF_CALLBACKS_TO_TRACK:
+            self.clear_old_notifications()
+        return NotificationClosure(notification_config.uid)
 
     @staticmethod
     def clear_old_notifications() -> None:
-        """Removes old notifications when we are passed our threshold."""
+        """Removes old notifications when we are passed our threshold. Only called once we are over the threshold."""
         while len(_FIFO_LIST) > _MAX_NUMBER_OF_CALLBACKS_TO_TRACK:
-            clear_notification_from_existence(_FIFO_LIST.pop(0))
+            clear_notification_from_existence(_FIFO_LIST.popitem(last=False)[0])
 
     @staticmethod
     def get_active_running_notifications() -> int:
@@ -94,74 +156,166 @@ class NotificationManager(metaclass=Singleton):
         """
         return len(_NOTIFICATION_MAP)
 
-    def catch_keyboard_interrupt(self, *args) -> None:
-        """We catch the keyboard interrupt but also pass it onto the user program."""
-        self.cleanup()
-        sys.exit(signal.SIGINT)
-
     def cleanup(self) -> None:
         """Stop all processes related to the Notification callback handling."""
+        if self._callback_listener_connection:
+            self._callback_listener_connection.close()
+        if self._callback_listener_process:
+            # Closing the connection makes the listener process stop once it sent the notifications that were still
+            # waiting in the connection. We only kill it when that takes too long.
+            self._callback_listener_process.join(timeout=5)
+            if self._callback_listener_process.is_alive():
+                self._callback_listener_process.kill()
+                self._callback_listener_process.join()
         if self._callback_executor_thread:
-            self._callback_executor_event.clear()
+            # The listener process is stopped, so the thread gets an EOFError and stops.
             self._callback_executor_thread.join()
-        if self._callback_listener_process:
-            self._callback_listener_process.kill()
+        if self._callback_connection:
+            loop = self._callback_connection_loop
+            if loop is None or loop.is_closed():
+                self._callback_connection.close()
+            elif is_running_on(loop):
+                stop_draining_on_asyncio_loop(loop, self._callback_connection)
+            else:
+                # We may be called from atexit or from another thread, and asyncio only allows changing the readers
+                # from the thread that runs the loop.
+                loop.call_soon_threadsafe(stop_draining_on_asyncio_loop, loop, self._callback_connection)
+        self._callback_connection = None
+        self._callback_connection_loop = None
         self._callback_executor_thread = None
         self._callback_listener_process = None
+        self._callback_listener_connection = None
         _NOTIFICATION_MAP.clear()
         _FIFO_LIST.clear()
 
 
+class NotificationClosure:
+    """
+    A handle to a notification that was created. It allows you to cancel the notification later on.
+    """
+
+    def __init__(self, uid: str):
+        self.uid = uid
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        """
+        Remove the notification from the Notification Center and forget about its callbacks. Calling this more than once
+        has no effect.
+        """
+        if self._cancelled:
+            return
+        self._cancelled = True
+        from mac_notifications import notification_sender
+
+        notification_sender.cancel_notification(self.uid)
+        clear_notification_from_existence(self.uid)
+
+
 class CallbackExecutorThread(Thread):
     """
-    Background threat that checks each 0.1 second whether there are any callbacks that it should execute.
+    Background thread that blocks on the callback connection and executes the callbacks it receives. It stops once the
+    listener process closed its end of the connection.
+    It is a daemon thread, so it doesn't keep the application alive. `NotificationManager.cleanup` stops it at exit.
     """
 
-    def __init__(self, keep_running: Event, callback_queue: SimpleQueue):
-        super().__init__()
-        self.event_indicating_to_continue = keep_running
-        self.callback_queue = callback_queue
+    def __init__(self, callback_connection: Connection):
+        super().__init__(daemon=True)
+        self.callback_connection = callback_connection
 
     def run(self) -> None:
-        while self.event_indicating_to_continue.is_set():
-            self.drain_queue()
-            time.sleep(0.1)
+        self.drain_connection()
 
-    def drain_queue(self) -> None:
+    def drain_connection(self) -> None:
         """
-        This drains the Callback Queue. When there is a notification for which a callback should be fired, this event is
-        added to the `callback_queue`. This background Threat is then responsible for listening in on the callback_queue
-        and when there is a callback it should execute, it executes it.
+        This drains the Callback connection. When there is a notification for which a callback should be fired, this
+        event is sent over the `callback_connection`. This background Thread is then responsible for listening in on the
+        callback_connection and when there is a callback it should execute, it executes it.
         """
-        while not self.callback_queue.empty():
-            msg = self.callback_queue.get()
-            notification_uid, event_id, reply_text = msg
-            if notification_uid not in _NOTIFICATION_MAP:
-                logger.debug(f"Received a notification interaction for {notification_uid} which we don't know.")
-                continue
-
-            if event_id == "action_button_clicked":
-                notification_config = _NOTIFICATION_MAP.pop(notification_uid)
-                logger.debug(f"Executing reply callback for notification {notification_config.title}.")
-                if notification_config.action_callback is None:
-                    raise ValueError(f"Notifications action button pressed without callback: {notification_config}.")
-                else:
-                    notification_config.action_callback()
-            elif event_id == "reply_button_clicked":
-                notification_config = _NOTIFICATION_MAP.pop(notification_uid)
-                logger.debug(f"Executing reply callback for notification {notification_config.title}, {reply_text}.")
-                if notification_config.reply_callback is None:
-                    raise ValueError(f"Notifications reply button pressed without callback: {notification_config}.")
-                else:
-                    notification_config.reply_callback(reply_text)
-            else:
-                raise ValueError(f"Unknown event_id: {event_id}.")
-            clear_notification_from_existence(notification_uid)
+        while drain_callback_connection(self.callback_connection):
+            pass
+
+
+def drain_callback_connection(callback_connection: Connection) -> bool:
+    """
+    Execute the callbacks for the user interactions sent over the callback connection. We block until a message
+    arrives and then also take all other messages that are already waiting, so a burst of user interactions is handled
+    in one go.
+    :param callback_connection: The connection the listener process sends the user interactions over.
+    :return: Whether the connection is still open. False once the listener process closed its end.
+    """
+    connection_open = True
+    frames: List[bytes] = []
+    try:
+        frames.append(callback_connection.recv_bytes())
+        while callback_connection.poll():
+            frames.append(callback_connection.recv_bytes())
+    except (EOFError, OSError):
+        connection_open = False
+    for frame in frames:
+        try:
+            notification_uid, event_id, reply_text = json.loads(frame)
+        except (TypeError, ValueError):
+            logger.warning(f"Received a malformed user interaction: {frame!r}.")
+            continue
+        execute_callback(notification_uid, event_id, reply_text)
+    return connection_open
+
+
+def drain_on_asyncio_loop(loop: AbstractEventLoop, callback_connection: Connection) -> None:
+    """Called by the asyncio loop when the callback connection is readable. Stops watching it once it is closed."""
+    if not drain_callback_connection(callback_connection):
+        loop.remove_reader(callback_connection.fileno())
+
+
+def start_draining_on_asyncio_loop(loop: AbstractEventLoop, callback_connection: Connection) -> None:
+    """Start watching the callback connection on the asyncio loop. Must run on the thread of the loop."""
+    if not callback_connection.closed:
+        loop.add_reader(callback_connection.fileno(), drain_on_asyncio_loop, loop, callback_connection)
+
+
+def stop_draining_on_asyncio_loop(loop: AbstractEventLoop, callback_connection: Connection) -> None:
+    """Stop watching the callback connection on the asyncio loop and close it. Must run on the thread of the loop."""
+    if not callback_connection.closed:
+        loop.remove_reader(callback_connection.fileno())
+        callback_connection.close()
+
+
+def is_running_on(loop: AbstractEventLoop) -> bool:
+    """Whether we are currently running on the thread of the given asyncio loop."""
+    import asyncio
+
+    try:
+        return asyncio.get_running_loop() is loop
+    except RuntimeError:
+        return False
+
+
+def execute_callback(notification_uid: str, event_id: str, reply_text: str) -> None:
+    """Execute the callback that belongs to the user interaction with a notification."""
+    notification_config = _NOTIFICATION_MAP.pop(notification_uid, None)
+    if notification_config is None:
+        logger.debug(f"Received a notification interaction for {notification_uid} which we don't know.")
+        return
+
+    if event_id == "action_button_clicked":
+        logger.debug(f"Executing reply callback for notification {notification_config.title}.")
+        if notification_config.action_callback is None:
+            raise ValueError(f"Notifications action button pressed without callback: {notification_config}.")
+        else:
+            notification_config.action_callback()
+    elif event_id == "reply_button_clicked":
+        logger.debug(f"Executing reply callback for notification {notification_config.title}, {reply_text}.")
+        if notification_config.reply_callback is None:
+            raise ValueError(f"Notifications reply button pressed without callback: {notification_config}.")
+        else:
+            notification_config.reply_callback(reply_text)
+    else:
+        raise ValueError(f"Unknown event_id: {event_id}.")
+    clear_notification_from_existence(notification_uid)
 
 
 def clear_notification_from_existence(notification_id: str) -> None:
     """Removes all records we had of a notification"""
-    if notification_id in _NOTIFICATION_MAP:
-        _NOTIFICATION_MAP.pop(notification_id)
-    if notification_id in _FIFO_LIST:
-        _FIFO_LIST.remove(notification_id)
+    _NOTIFICATION_MAP.pop(notification_id, None)
+    _FIFO_LIST.pop(notification_id, None)
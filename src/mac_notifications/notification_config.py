@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import json
 import uuid
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import timedelta
 from typing import Callable
 
@@ -62,10 +63,24 @@ class JSONNotificationConfig:
     without completely halting/freezing our main process, we need to open it in a background process. However, to be
     able to transfer the data from the notification to the other process, all the arguments should be serializable. As
     callbacks/functions are not serializable, we replaced them by booleans on whether it contained a callback or not.
-    Once a callback should be triggered, we send a message over a multiprocessing Queue and trigger the callback in
+    Once a callback should be triggered, we send a message over a multiprocessing Pipe and trigger the callback in
     the main process.
     """
 
+    __slots__ = (
+        "title",
+        "subtitle",
+        "text",
+        "icon",
+        "delay_in_seconds",
+        "action_button_str",
+        "action_callback_present",
+        "reply_button_str",
+        "reply_callback_present",
+        "snooze_button_str",
+        "uid",
+    )
+
     title: str
     subtitle: str | None
     text: str | None
@@ -81,3 +96,12 @@ class JSONNotificationConfig:
     @property
     def contains_callback(self) -> bool:
         return bool(self.action_callback_present or self.reply_callback_present)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the configuration to send it to another process. JSON is cheaper and safer to load than pickle."""
+        return json.dumps(asdict(self)).encode()
+
+    @staticmethod
+    def from_bytes(data: bytes) -> "JSONNotificationConfig":
+        """Deserialize a configuration that was serialized with `to_bytes`."""
+        return JSONNotificationConfig(**json.loads(data))
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import json
 import logging
-from multiprocessing import SimpleQueue
-from typing import Any
+from functools import lru_cache
+from multiprocessing.connection import Connection
+from typing import Callable, Tuple
 
+import objc
 from AppKit import NSImage
 from Foundation import NSDate, NSObject, NSURL, NSUserNotification, NSUserNotificationCenter
 from PyObjCTools import AppHelper
@@ -16,94 +19,130 @@ logger = logging.getLogger()
 This module is responsible for creating the notifications in the C-layer and listening/reporting about user activity.
 """
 
+# Every lookup of the default notification center crosses the Objective-C bridge, so we only do it once per process.
+_NOTIFICATION_CENTER: NSUserNotificationCenter | None = None
 
-def create_notification(config: JSONNotificationConfig, queue_to_submit_events_to: SimpleQueue | None) -> Any:
+
+def _get_notification_center() -> NSUserNotificationCenter:
+    """Return the default NSUserNotificationCenter, looking it up on first use."""
+    global _NOTIFICATION_CENTER
+    if _NOTIFICATION_CENTER is None:
+        _NOTIFICATION_CENTER = NSUserNotificationCenter.defaultUserNotificationCenter()
+    return _NOTIFICATION_CENTER
+
+
+@lru_cache(maxsize=32)
+def _load_image(path: str) -> NSImage:
+    """Load the image at `path`. Images are cached, so an icon used by many notifications is only read once."""
+    url = NSURL.alloc().initWithString_(f"file://{path}")
+    return NSImage.alloc().initWithContentsOfURL_(url)
+
+
+def send_notification(config: JSONNotificationConfig) -> None:
     """
-    Create a notification and possibly listed & report about notification activity.
+    Create and schedule a notification.
     :param config: The configuration of the notification to send.
-    :param queue_to_submit_events_to: The Queue to submit user activity related to the callbacks to. If this argument
-    is passed, it will start the event listener after it created the Notifications. If this is None, it will only
-    create the notification.
     """
+    notification = NSUserNotification.alloc().init()
+    notification.setIdentifier_(config.uid)
+    if config is not None:
+        notification.setTitle_(config.title)
+    if config.subtitle is not None:
+        notification.setSubtitle_(config.subtitle)
+    if config.text is not None:
+        notification.setInformativeText_(config.text)
+    if config.icon is not None:
+        notification.setContentImage_(_load_image(config.icon))
+
+    # Notification buttons (main action button and other button)
+    if config.action_button_str:
+        notification.setActionButtonTitle_(config.action_button_str)
+        notification.setHasActionButton_(True)
+
+    if config.snooze_button_str:
+        notification.setOtherButtonTitle_(config.snooze_button_str)
+
+    if config.reply_callback_present:
+        notification.setHasReplyButton_(True)
+        if config.reply_button_str:
+            notification.setResponsePlaceholder_(config.reply_button_str)
+
+    # Setting delivery date as current date + delay (in seconds). Without a delivery date it is delivered immediately.
+    if config.delay_in_seconds:
+        notification.setDeliveryDate_(NSDate.dateWithTimeInterval_sinceDate_(config.delay_in_seconds, NSDate.date()))
+
+    # Schedule the notification send
+    _get_notification_center().scheduleNotification_(notification)
+
+
+def cancel_notification(uid: str) -> None:
+    """
+    Remove a notification from the Notification Center, both when it is still scheduled and when it was delivered.
+    :param uid: The uid of the notification to remove.
+    """
+    notification_center = _get_notification_center()
+    # The center compares against the notification objects it holds, so we look up those by their identifier.
+    for notification in notification_center.scheduledNotifications():
+        if notification.identifier() == uid:
+            notification_center.removeScheduledNotification_(notification)
+    for notification in notification_center.deliveredNotifications():
+        if notification.identifier() == uid:
+            notification_center.removeDeliveredNotification_(notification)
+
+
+class NSUserNotificationCenterDelegate(NSObject):
+    """
+    The delegate of the NSUserNotificationCenter. It reports the user interactions with our notifications to the handler
+    set through `setHandler_`.
+    """
+
+    @objc.python_method
+    def setHandler_(self, handler: Callable[[Tuple[str, str, str]], None]) -> None:
+        """Set the function that is called with (uid, event_id, reply_text) for each user interaction."""
+        self._handler = handler
+
+    def userNotificationCenter_didDeliverNotification_(
+        self, center: "_NSConcreteUserNotificationCenter", notif: "_NSConcreteUserNotification"  # type: ignore  # noqa
+    ) -> None:
+        """Respond to the delivering of the notification."""
+        logger.debug(f"Delivered: {notif.identifier()}")
+
+    def userNotificationCenter_didActivateNotification_(
+        self, center: "_NSConcreteUserNotificationCenter", notif: "_NSConcreteUserNotification"  # type: ignore  # noqa
+    ) -> None:
+        """
+        Respond to a user interaction with the notification.
+        """
+        identifier = notif.identifier()
+        response = notif.response()
+        activation_type = notif.activationType()
+
+        logger.debug(f"User interacted with {identifier} with activationType {activation_type}.")
+        if activation_type == 1:
+            # user clicked on the notification (not on a button)
+            pass
+
+        elif activation_type == 2:  # user clicked on the action button
+            self._handler((identifier, "action_button_clicked", ""))
+
+        elif activation_type == 3:  # User clicked on the reply button
+            self._handler((identifier, "reply_button_clicked", response.string()))
+
+
+def wait_activations(connection_to_submit_events_to: Connection) -> None:
+    """
+    Listen for user interactions with our notifications and report them. This is a blocking call that runs the Cocoa
+    event loop.
+    :param connection_to_submit_events_to: The connection to submit user activity related to the callbacks to.
+    """
+
+    def submit_event(event: Tuple[str, str, str]) -> None:
+        connection_to_submit_events_to.send_bytes(json.dumps(event).encode())
+
+    delegate = NSUserNotificationCenterDelegate.alloc().init()
+    delegate.setHandler_(submit_event)
+    _get_notification_center().setDelegate_(delegate)
 
-    class MacOSNotification(NSObject):
-        def send(self):
-            """Sending of the notification"""
-            notification = NSUserNotification.alloc().init()
-            notification.setIdentifier_(config.uid)
-            if config is not None:
-                notification.setTitle_(config.title)
-            if config.subtitle is not None:
-                notification.setSubtitle_(config.subtitle)
-            if config.text is not None:
-                notification.setInformativeText_(config.text)
-            if config.icon is not None:
-                url = NSURL.alloc().initWithString_(f"file://{config.icon}")
-                image = NSImage.alloc().initWithContentsOfURL_(url)
-                notification.setContentImage_(image)
-
-            # Notification buttons (main action button and other button)
-            if config.action_button_str:
-                notification.setActionButtonTitle_(config.action_button_str)
-                notification.setHasActionButton_(True)
-
-            if config.snooze_button_str:
-                notification.setOtherButtonTitle_(config.snooze_button_str)
-
-            if config.reply_callback_present:
-                notification.setHasReplyButton_(True)
-                if config.reply_button_str:
-                    notification.setResponsePlaceholder_(config.reply_button_str)
-
-            NSUserNotificationCenter.defaultUserNotificationCenter().setDelegate_(self)
-
-            # Setting delivery date as current date + delay (in seconds)
-            notification.setDeliveryDate_(
-                NSDate.dateWithTimeInterval_sinceDate_(config.delay_in_seconds, NSDate.date())
-            )
-
-            # Schedule the notification send
-            NSUserNotificationCenter.defaultUserNotificationCenter().scheduleNotification_(notification)
-
-            # Wait for the notification CallBack to happen.
-            if queue_to_submit_events_to:
-                logger.debug("Started listening for user interactions with notifications.")
-                AppHelper.runConsoleEventLoop()
-
-        def userNotificationCenter_didDeliverNotification_(
-            self, center: "_NSConcreteUserNotificationCenter", notif: "_NSConcreteUserNotification"  # type: ignore  # noqa
-        ) -> None:
-            """Respond to the delivering of the notification."""
-            logger.debug(f"Delivered: {notif.identifier()}")
-
-        def userNotificationCenter_didActivateNotification_(
-            self, center: "_NSConcreteUserNotificationCenter", notif: "_NSConcreteUserNotification"  # type: ignore  # noqa
-        ) -> None:
-            """
-            Respond to a user interaction with the notification.
-            """
-            identifier = notif.identifier()
-            response = notif.response()
-            activation_type = notif.activationType()
-
-            if queue_to_submit_events_to is None:
-                raise ValueError("Queue should not be None here.")
-            else:
-                queue: SimpleQueue = queue_to_submit_events_to
-
-            logger.debug(f"User interacted with {identifier} with activationType {activation_type}.")
-            if activation_type == 1:
-                # user clicked on the notification (not on a button)
-                pass
-
-            elif activation_type == 2:  # user clicked on the action button
-                queue.put((identifier, "action_button_clicked", ""))
-
-            elif activation_type == 3:  # User clicked on the reply button
-                queue.put((identifier, "reply_button_clicked", response.string()))
-
-    # create the new notification
-    new_notif = MacOSNotification.alloc().init()
-
-    # return notification
-    return new_notif
+    # Wait for the notification CallBack to happen.
+    logger.debug("Started listening for user interactions with notifications.")
+    AppHelper.runConsoleEventLoop()